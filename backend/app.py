@@ -1,5 +1,4 @@
 import os
-import shutil
 import csv
 import io
 from datetime import date
@@ -20,19 +19,23 @@ from database import db
 from models import User, ChatHistory, UsageAnalytics
 
 # --- RAG SERVICE IMPORTS ---
-from services.pdf_loader import extract_text_from_pdf
-from services.text_cleaner import clean_text
-from services.text_chunker import chunk_text
+from services.document_indexer import DocumentManifest, index_pdf, remove_pdf
 from services.embedding_service import EmbeddingService
-from services.vector_store import VectorStore
+from services.vector_service import open_vector_store, VectorServiceUnavailable
 from services.qa_engine import QAEngine
 from services.hybrid_search import hybrid_rerank
+from services.cross_encoder_reranker import CrossEncoderReranker
 
 # Initialize Services
 embedding_service = EmbeddingService()
 qa_engine = QAEngine()
+reranker = CrossEncoderReranker(
+    top_k=Config.RERANK_TOP_K, budget_ms=Config.RERANK_BUDGET_MS
+) if Config.RERANKER_ENABLED else None
 mail = Mail()
 
+VECTOR_SERVICE_DOWN_MESSAGE = "Document search is temporarily unavailable. Please try again shortly. ⚠️"
+
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in {"pdf"}
 
@@ -99,6 +102,11 @@ def create_app():
     def server_error(e):
         return render_template("error.html", message="Internal server error"), 500
 
+    @app.errorhandler(VectorServiceUnavailable)
+    def vector_service_unavailable(e):
+        print(f"⚠️ {e}")
+        return render_template("error.html", message=VECTOR_SERVICE_DOWN_MESSAGE), 503
+
     # --- EXPORT ROUTES ---
     @app.route("/export/csv")
     @login_required
@@ -163,25 +171,35 @@ def create_app():
         os.makedirs(user_upload_dir, exist_ok=True)
         os.makedirs(user_index_dir, exist_ok=True)
 
-        vector_store = VectorStore(user_index_dir)
-        vector_store.load()
-
-        if request.method == "POST":
+        vector_store = open_vector_store(user_index_dir, app.config["VECTOR_SERVICE_SOCKET"])
+        try:
+            vector_store.load()
+            service_available = True
+        except VectorServiceUnavailable as e:
+            # Still render history and files; only uploads and questions need the index
+            print(f"⚠️ {e}")
+            flash(VECTOR_SERVICE_DOWN_MESSAGE)
+            service_available = False
+
+        if request.method == "POST" and service_available:
             if "pdf_files" in request.files:
                 files = request.files.getlist("pdf_files")
-                count = 0
+                manifest = DocumentManifest(user_index_dir)
+                count = skipped = 0
                 for file in files:
                     if file and allowed_file(file.filename):
                         filename = secure_filename(file.filename)
                         path = os.path.join(user_upload_dir, filename)
                         file.save(path)
-                        text = clean_text(extract_text_from_pdf(path))
-                        chunks = chunk_text(text, source=filename)
-                        embeddings = embedding_service.embed_texts([c["text"] for c in chunks])
-                        vector_store.create_or_update_index(embeddings, chunks)
-                        count += 1
+                        # Re-uploads only re-embed pages whose content changed
+                        status, _ = index_pdf(path, filename, vector_store, embedding_service, manifest)
+                        if status == "unchanged":
+                            skipped += 1
+                        else:
+                            count += 1
                 if count > 0: track_usage("upload_pdf")
                 flash(f"{count} PDF(s) Indexed! ✅")
+                if skipped > 0: flash(f"{skipped} unchanged PDF(s) skipped. ⏭️")
 
             elif "query" in request.form:
                 if not check_rate_limit(app.config["MAX_QUESTIONS_PER_DAY"]):
@@ -193,9 +211,17 @@ def create_app():
                     flash("Upload PDFs first! ⚠️")
                 else:
                     query_embedding = embedding_service.embed_texts([question])[0]
-                    retrieved_chunks = vector_store.search(query_embedding, top_k=8)
-                    retrieved_chunks = hybrid_rerank(question, retrieved_chunks)
-                    answer_data = qa_engine.generate_answer(question, retrieved_chunks)
+                    if reranker:
+                        # Wider FAISS candidate set, narrowed down by the cross-encoder
+                        retrieved_chunks = vector_store.search(query_embedding, top_k=app.config["RERANK_CANDIDATES"])
+                        retrieved_chunks = reranker.rerank(question, retrieved_chunks)
+                    else:
+                        retrieved_chunks = vector_store.search(query_embedding, top_k=8)
+                        retrieved_chunks = hybrid_rerank(question, retrieved_chunks)
+                    # The reranker deliberately keeps fewer chunks, so confidence is measured against its k
+                    answer_data = qa_engine.generate_answer(
+                        question, retrieved_chunks, expected_chunks=reranker.top_k if reranker else 8
+                    )
                     track_usage("ask_question")
                     db.session.add(ChatHistory(question=question, answer=answer_data["answer"], user_id=current_user.id))
                     db.session.commit()
@@ -213,14 +239,10 @@ def create_app():
         user_index_dir = os.path.join(app.config["INDEX_DIR"], user_folder)
         file_path = os.path.join(user_upload_dir, filename)
         if os.path.exists(file_path): os.remove(file_path)
-        if os.path.exists(user_index_dir): shutil.rmtree(user_index_dir)
         os.makedirs(user_index_dir, exist_ok=True)
-        vs = VectorStore(user_index_dir)
-        for pdf in os.listdir(user_upload_dir):
-            txt = clean_text(extract_text_from_pdf(os.path.join(user_upload_dir, pdf)))
-            chunks = chunk_text(txt, source=pdf)
-            vs.create_or_update_index(embedding_service.embed_texts([c["text"] for c in chunks]), chunks)
-        flash(f"Deleted {filename} and re-indexed. ✅")
+        vs = open_vector_store(user_index_dir, app.config["VECTOR_SERVICE_SOCKET"])
+        remove_pdf(filename, vs, DocumentManifest(user_index_dir))
+        flash(f"Deleted {filename} and removed it from the index. ✅")
         return redirect(url_for("home"))
 
     return app
@@ -0,0 +1 @@
+"""Offline benchmark and load-test harness for the ingest and query paths."""
@@ -0,0 +1,71 @@
+import os
+import random
+import fitz  # PyMuPDF
+
+# Small fixed vocabulary so queries reliably overlap with document text
+VOCABULARY = (
+    "invoice payment contract warranty battery engine sensor network server "
+    "database backup policy employee schedule budget report revenue customer "
+    "support ticket release version install configure password account upload "
+    "document manual section chapter figure table appendix safety voltage "
+    "pressure temperature calibration maintenance inspection procedure step "
+    "warning error code reset device firmware update license agreement term"
+).split()
+
+
+def random_paragraph(rng, words=60):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize() + "."
+
+
+def generate_pdf(path, pages, rng, paragraphs_per_page=6):
+    """Writes a synthetic multi-page PDF and returns its page count."""
+    doc = fitz.open()
+    for page_num in range(pages):
+        page = doc.new_page()
+        body = "\n\n".join(random_paragraph(rng) for _ in range(paragraphs_per_page))
+        page.insert_textbox(fitz.Rect(50, 50, 545, 790), f"Page {page_num + 1}\n\n{body}", fontsize=9)
+    doc.save(path)
+    doc.close()
+    return pages
+
+
+def modify_pdf(path, page_num=0, seed=7):
+    """Appends a new paragraph to one page in place, leaving the other pages untouched."""
+    doc = fitz.open(path)
+    doc[page_num].insert_textbox(fitz.Rect(50, 700, 545, 790), random_paragraph(random.Random(seed), 30), fontsize=9)
+    doc.save(path + ".tmp")
+    doc.close()
+    os.replace(path + ".tmp", path)
+
+
+def insert_page(path, page_num=0, seed=11):
+    """Inserts a new page in place, shifting every later page down by one."""
+    doc = fitz.open(path)
+    page = doc.new_page(pno=page_num)
+    page.insert_textbox(fitz.Rect(50, 50, 545, 790), random_paragraph(random.Random(seed)), fontsize=9)
+    doc.save(path + ".tmp")
+    doc.close()
+    os.replace(path + ".tmp", path)
+
+
+def generate_corpus(out_dir, num_docs=5, pages_per_doc=10, seed=42):
+    """
+    Generates a reproducible corpus of synthetic PDFs.
+    Returns a list of (path, page_count) tuples.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    rng = random.Random(seed)
+    corpus = []
+    for i in range(num_docs):
+        path = os.path.join(out_dir, f"synthetic_{i:03d}.pdf")
+        corpus.append((path, generate_pdf(path, pages_per_doc, rng)))
+    return corpus
+
+
+def generate_queries(count=20, seed=42):
+    """Generates reproducible natural-language style questions."""
+    rng = random.Random(seed + 1)
+    return [
+        f"What does the {rng.choice(VOCABULARY)} {rng.choice(VOCABULARY)} say about {rng.choice(VOCABULARY)}?"
+        for _ in range(count)
+    ]
@@ -0,0 +1,188 @@
+"""
+Concurrent HTTP load test against the Flask app.
+
+Usage (from backend/):
+    python -m benchmarks.load_test --concurrency 8 --requests 200
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --username admin --password secret
+
+Without --url the app is started in-process with stub embeddings and a stub
+LLM, a throwaway SQLite database and temporary upload/index folders.
+Against a real deployment, use an admin account so the daily question limit
+does not turn the run into redirects.
+"""
+import os
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from benchmarks.stubs import install_stubs
+from benchmarks.corpus import generate_corpus, generate_queries
+from benchmarks.run_benchmarks import percentiles, peak_rss_mb, git_commit
+
+BENCH_USERNAME = "bench_admin"
+BENCH_PASSWORD = "bench-password"
+# Only rendered when home() actually answered (not for "Upload PDFs first!" etc.)
+ANSWER_MARKER = 'class="answer-container'
+
+
+def start_local_server(workdir):
+    """Boots create_app() on an ephemeral port and returns (base_url, server)."""
+    # Config is already imported by now, so override it directly rather than via env vars.
+    # The reranker is forced off so the offline run never downloads a cross-encoder,
+    # and the vector service is forced off so the run stays self-contained.
+    from config import Config
+    Config.SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    Config.RERANKER_ENABLED = False
+    Config.VECTOR_SERVICE_SOCKET = None
+    install_stubs()
+
+    from werkzeug.serving import make_server
+    from werkzeug.security import generate_password_hash
+    from app import create_app
+    from database import db
+    from models import User
+
+    app = create_app()
+    app.config.update(
+        UPLOAD_DIR=os.path.join(workdir, "uploads"),
+        INDEX_DIR=os.path.join(workdir, "faiss_index"),
+    )
+    with app.app_context():
+        db.session.add(User(
+            username=BENCH_USERNAME,
+            email="bench@example.com",
+            password=generate_password_hash(BENCH_PASSWORD, method="pbkdf2:sha256"),
+            role="admin",  # Admins bypass the daily question limit
+        ))
+        db.session.commit()
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"http://127.0.0.1:{server.server_port}", server
+
+
+def login(base_url, username, password):
+    session = requests.Session()
+    resp = session.post(f"{base_url}/login", data={"username": username, "password": password}, allow_redirects=False)
+    if resp.status_code != 302:
+        raise RuntimeError(f"Login failed for {username} (HTTP {resp.status_code})")
+    return session
+
+
+def upload_corpus(session, base_url, corpus):
+    """Uploads every synthetic PDF in one request and returns the elapsed seconds."""
+    handles = [open(path, "rb") for path, _ in corpus]
+    try:
+        files = [("pdf_files", (os.path.basename(path), fh, "application/pdf")) for (path, _), fh in zip(corpus, handles)]
+        t = time.perf_counter()
+        resp = session.post(f"{base_url}/", files=files)
+        elapsed = time.perf_counter() - t
+    finally:
+        for fh in handles:
+            fh.close()
+    resp.raise_for_status()
+    return elapsed
+
+
+def run_load(base_url, username, password, questions, total_requests, concurrency):
+    # One logged-in session per worker thread, like independent browsers
+    sessions = [login(base_url, username, password) for _ in range(concurrency)]
+    latencies, errors = [], []
+    lock = threading.Lock()
+
+    def worker(i):
+        session = sessions[i % concurrency]
+        question = questions[i % len(questions)]
+        t = time.perf_counter()
+        try:
+            resp = session.post(f"{base_url}/", data={"query": question}, allow_redirects=False)
+            ok = resp.status_code == 200 and ANSWER_MARKER in resp.text
+        except requests.RequestException:
+            ok = False
+        elapsed_ms = (time.perf_counter() - t) * 1000
+        with lock:
+            (latencies if ok else errors).append(elapsed_ms)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(worker, range(total_requests)))
+    wall = time.perf_counter() - started
+
+    result = percentiles(latencies)
+    result.update({
+        "concurrency": concurrency,
+        "requests": total_requests,
+        "errors": len(errors),
+        "seconds": round(wall, 4),
+        "requests_per_s": round(total_requests / wall, 2) if wall else None,
+    })
+    return result
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Concurrent HTTP load test for the Q&A app")
+    parser.add_argument("--url", help="Target an already running app instead of an in-process one")
+    parser.add_argument("--username", default=BENCH_USERNAME)
+    parser.add_argument("--password", default=BENCH_PASSWORD)
+    parser.add_argument("--docs", type=int, default=3, help="Synthetic PDFs uploaded before the run")
+    parser.add_argument("--pages", type=int, default=10, help="Pages per synthetic PDF")
+    parser.add_argument("--no-upload", action="store_true", help="Skip the warm-up upload")
+    parser.add_argument("--requests", type=int, default=100, help="Total questions to send")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel client sessions")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="Write JSON results to this path")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    workdir = tempfile.mkdtemp(prefix="rag_load_")
+    server = None
+    try:
+        base_url = args.url
+        if not base_url:
+            base_url, server = start_local_server(workdir)
+
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "target": args.url or "in-process",
+                "params": {k: v for k, v in vars(args).items() if k not in ("password", "output")},
+            },
+        }
+
+        if not args.no_upload:
+            corpus = generate_corpus(os.path.join(workdir, "pdfs"), args.docs, args.pages, args.seed)
+            uploader = login(base_url, args.username, args.password)
+            results["upload"] = {
+                "documents": len(corpus),
+                "pages": sum(pages for _, pages in corpus),
+                "seconds": round(upload_corpus(uploader, base_url, corpus), 4),
+            }
+
+        questions = generate_queries(max(1, min(args.requests, 100)), args.seed)
+        results["load"] = run_load(base_url, args.username, args.password, questions, args.requests, args.concurrency)
+        if server:
+            results["memory"] = {"peak_rss_mb": peak_rss_mb()}
+    finally:
+        if server:
+            server.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+        print(f"📊 Results written to {args.output}")
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,360 @@
+"""
+Offline benchmark suite for the ingest and query paths.
+
+Usage (from backend/):
+    python -m benchmarks.run_benchmarks --docs 10 --pages 20 --output results.json
+    python -m benchmarks.run_benchmarks --compare baseline.json
+    python -m benchmarks.run_benchmarks --rerank --rerank-pair-ms 0.5
+
+Embeddings and answers come from deterministic stubs, so numbers are
+comparable across commits and no network access is needed.
+"""
+import os
+import sys
+import json
+import math
+import time
+import shutil
+import argparse
+import platform
+import resource
+import subprocess
+import tempfile
+import threading
+from datetime import datetime
+
+from benchmarks.stubs import StubEmbeddingService, StubQAEngine, StubCrossEncoder
+from benchmarks.corpus import VOCABULARY, generate_corpus, generate_queries, insert_page, modify_pdf
+from services.vector_service import VectorServiceServer, open_vector_store
+from services.hybrid_search import hybrid_rerank
+from services.document_indexer import DocumentManifest, index_pdf
+from services.cross_encoder_reranker import CrossEncoderReranker
+
+
+def percentiles(samples_ms):
+    """Summarises a list of latencies (ms) with nearest-rank percentiles."""
+    if not samples_ms:
+        return {}
+    ordered = sorted(samples_ms)
+
+    def pick(p):
+        return round(ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)], 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "p50_ms": pick(50),
+        "p95_ms": pick(95),
+        "p99_ms": pick(99),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def peak_rss_mb():
+    """Process memory high-water mark in MB (ru_maxrss is KB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(peak / divisor, 2)
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL, text=True).strip()
+    except Exception:
+        return None
+
+
+class _TimedEmbedding:
+    """Wraps an embedding service to record time spent and chunks embedded."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.seconds = 0.0
+        self.chunks = 0
+
+    def embed_texts(self, texts):
+        t = time.perf_counter()
+        embeddings = self.inner.embed_texts(texts)
+        self.seconds += time.perf_counter() - t
+        self.chunks += len(texts)
+        return embeddings
+
+
+class _TimedStore:
+    """Wraps a vector store to record time spent writing the index."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.seconds = 0.0
+
+    def load(self):
+        self.inner.load()
+
+    def replace_chunks(self, *args):
+        t = time.perf_counter()
+        self.inner.replace_chunks(*args)
+        self.seconds += time.perf_counter() - t
+
+
+def bench_ingest(corpus, index_dir, embedding_service, socket_path=None):
+    """
+    Times index_pdf, the ingest path used by home(). Embedding and index
+    writes are timed separately; "extract" covers per-page extraction,
+    cleaning, hashing and chunking.
+    """
+    vector_store = _TimedStore(open_vector_store(index_dir, socket_path))
+    embedder = _TimedEmbedding(embedding_service)
+    manifest = DocumentManifest(index_dir).load()
+    total_pages = 0
+
+    started = time.perf_counter()
+    for path, pages in corpus:
+        index_pdf(path, os.path.basename(path), vector_store, embedder, manifest)
+        total_pages += pages
+    elapsed = time.perf_counter() - started
+
+    return {
+        "documents": len(corpus),
+        "pages": total_pages,
+        "chunks": embedder.chunks,
+        "seconds": round(elapsed, 4),
+        "pages_per_s": round(total_pages / elapsed, 2) if elapsed else None,
+        "chunks_per_s": round(embedder.chunks / elapsed, 2) if elapsed else None,
+        "stage_seconds": {
+            "extract": round(elapsed - embedder.seconds - vector_store.seconds, 4),
+            "embed": round(embedder.seconds, 4),
+            "index": round(vector_store.seconds, 4),
+        },
+    }
+
+
+def bench_reingest(corpus, index_dir, embedding_service, socket_path=None):
+    """
+    Measures change detection on re-upload: first upload, unchanged
+    re-upload, re-upload after editing a single page of one document, and
+    re-upload after inserting a page at the front of it.
+    """
+    vector_store = open_vector_store(index_dir, socket_path)
+    vector_store.load()
+    manifest = DocumentManifest(index_dir).load()
+
+    def upload_all():
+        t = time.perf_counter()
+        pages = sum(index_pdf(path, os.path.basename(path), vector_store, embedding_service, manifest)[1]
+                    for path, _ in corpus)
+        return {"seconds": round(time.perf_counter() - t, 4), "pages_embedded": pages,
+                "vectors": vector_store.index.ntotal if vector_store.index is not None else 0}
+
+    results = {"first_upload": upload_all(), "unchanged_reupload": upload_all()}
+    modify_pdf(corpus[0][0])
+    results["one_page_changed"] = upload_all()
+    insert_page(corpus[0][0])
+    results["page_inserted_at_front"] = upload_all()
+    return results
+
+
+def bench_index_load(index_dir, repeats, socket_path=None, server=None):
+    """
+    Times loading the index from disk. In service mode a client load() is
+    only a stats RPC, so the cold load is timed on the server (evicting the
+    shard first) and the RPC is reported separately as stats_rpc.
+    """
+    load_ms, rpc_ms = [], []
+    vector_store = None
+    for _ in range(repeats):
+        if server:
+            server.shards.pop(os.path.abspath(index_dir), None)
+            t = time.perf_counter()
+            server.shard(index_dir)
+            load_ms.append((time.perf_counter() - t) * 1000)
+
+        vector_store = open_vector_store(index_dir, socket_path)
+        t = time.perf_counter()
+        vector_store.load()
+        (rpc_ms if server else load_ms).append((time.perf_counter() - t) * 1000)
+
+    results = {"index_load": percentiles(load_ms)}
+    if server:
+        results["stats_rpc"] = percentiles(rpc_ms)
+    return vector_store, results
+
+
+def bench_search(vector_store, queries, embedding_service, top_k):
+    embed_ms, search_ms, rerank_ms = [], [], []
+    for question in queries:
+        t = time.perf_counter()
+        query_embedding = embedding_service.embed_texts([question])[0]
+        embed_ms.append((time.perf_counter() - t) * 1000)
+
+        t = time.perf_counter()
+        retrieved = vector_store.search(query_embedding, top_k=top_k)
+        search_ms.append((time.perf_counter() - t) * 1000)
+
+        t = time.perf_counter()
+        hybrid_rerank(question, retrieved)
+        rerank_ms.append((time.perf_counter() - t) * 1000)
+
+    return {
+        "embed": percentiles(embed_ms),
+        "search": percentiles(search_ms),
+        "rerank": percentiles(rerank_ms),
+    }
+
+
+def term_coverage(question, chunks):
+    """Quality proxy: share of the question's content words present in the prompt context."""
+    terms = set(question.lower().strip("?").split()) & set(VOCABULARY)
+    if not terms:
+        return 1.0
+    context_words = set(" ".join(c["text"] for c in chunks).lower().split())
+    return len(terms & context_words) / len(terms)
+
+
+def bench_end_to_end(vector_store, queries, embedding_service, qa_engine, top_k, reranker=None):
+    """
+    Times the full question path from home(): embed, search, rerank, answer.
+    With a reranker, top_k is the wider FAISS candidate count.
+    """
+    samples, prompt_chars, chunk_counts, coverage = [], [], [], []
+    for question in queries:
+        t = time.perf_counter()
+        query_embedding = embedding_service.embed_texts([question])[0]
+        retrieved = vector_store.search(query_embedding, top_k=top_k)
+        if reranker:
+            retrieved = reranker.rerank(question, retrieved)
+        else:
+            retrieved = hybrid_rerank(question, retrieved)
+        answer_data = qa_engine.generate_answer(question, retrieved, expected_chunks=reranker.top_k if reranker else 8)
+        samples.append((time.perf_counter() - t) * 1000)
+        prompt_chars.append(answer_data.get("prompt_chars", 0))
+        chunk_counts.append(len(retrieved))
+        coverage.append(term_coverage(question, retrieved))
+
+    result = percentiles(samples)
+    result["mean_prompt_chars"] = round(sum(prompt_chars) / len(prompt_chars), 1) if prompt_chars else 0
+    result["mean_chunks"] = round(sum(chunk_counts) / len(chunk_counts), 2) if chunk_counts else 0
+    result["mean_term_coverage"] = round(sum(coverage) / len(coverage), 4) if coverage else 0
+    return result
+
+
+def bench_rerank_tradeoff(vector_store, queries, embedding_service, qa_engine, args):
+    """Compares the default path against cross-encoder reranking, cold and warm cache."""
+    model = StubCrossEncoder(args.rerank_pair_ms) if not args.rerank_model else None
+    reranker = CrossEncoderReranker(
+        model_name=args.rerank_model or "stub", model=model,
+        top_k=args.rerank_top_k, budget_ms=args.rerank_budget_ms,
+    )
+    return {
+        "baseline": bench_end_to_end(vector_store, queries, embedding_service, qa_engine, args.top_k),
+        "reranked_cold": bench_end_to_end(vector_store, queries, embedding_service, qa_engine, args.rerank_candidates, reranker),
+        "reranked_warm": bench_end_to_end(vector_store, queries, embedding_service, qa_engine, args.rerank_candidates, reranker),
+    }
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="rag_bench_")
+    server = socket_path = None
+    try:
+        if args.vector_service:
+            # Route every index operation through an in-process vector service
+            socket_path = os.path.join(workdir, "vectors.sock")
+            server = VectorServiceServer(socket_path)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        embedding_service = StubEmbeddingService()
+        qa_engine = StubQAEngine()
+        corpus = generate_corpus(os.path.join(workdir, "pdfs"), args.docs, args.pages, args.seed)
+        queries = generate_queries(args.queries, args.seed)
+        index_dir = os.path.join(workdir, "index")
+
+        results = {
+            "meta": {
+                "commit": git_commit(),
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "params": vars(args).copy(),
+            },
+        }
+        results["meta"]["params"].pop("compare", None)
+        results["meta"]["params"].pop("output", None)
+
+        results["ingest"] = bench_ingest(corpus, index_dir, embedding_service, socket_path)
+        vector_store, load_results = bench_index_load(index_dir, args.load_repeats, socket_path, server)
+        results.update(load_results)
+        results["reingest"] = bench_reingest(corpus, os.path.join(workdir, "reingest_index"), embedding_service, socket_path)
+        results["query"] = bench_search(vector_store, queries, embedding_service, args.top_k)
+        results["end_to_end"] = bench_end_to_end(vector_store, queries, embedding_service, qa_engine, args.top_k)
+        if args.rerank:
+            results["rerank_tradeoff"] = bench_rerank_tradeoff(vector_store, queries, embedding_service, qa_engine, args)
+        results["memory"] = {"peak_rss_mb": peak_rss_mb()}
+        return results
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def flatten(results, prefix=""):
+    """Flattens nested numeric results into dotted keys for comparison."""
+    flat = {}
+    for key, value in results.items():
+        if key == "meta":
+            continue
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline, current):
+    """Prints the relative change of every shared metric against a baseline run."""
+    old, new = flatten(baseline), flatten(current)
+    print(f"{'metric':<40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name in sorted(old.keys() & new.keys()):
+        delta = f"{(new[name] - old[name]) / old[name] * 100:+.1f}%" if old[name] else "n/a"
+        print(f"{name:<40} {old[name]:>12} {new[name]:>12} {delta:>9}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Offline RAG ingest/query benchmarks")
+    parser.add_argument("--docs", type=int, default=5, help="Number of synthetic PDFs")
+    parser.add_argument("--pages", type=int, default=10, help="Pages per synthetic PDF")
+    parser.add_argument("--queries", type=int, default=50, help="Number of benchmark questions")
+    parser.add_argument("--top-k", type=int, default=8, help="FAISS candidates per question")
+    parser.add_argument("--load-repeats", type=int, default=5, help="Index load repetitions")
+    parser.add_argument("--seed", type=int, default=42, help="Corpus/query RNG seed")
+    parser.add_argument("--vector-service", action="store_true", help="Serve indexes through the Unix-socket vector service")
+    parser.add_argument("--rerank", action="store_true", help="Also benchmark cross-encoder reranking")
+    parser.add_argument("--rerank-candidates", type=int, default=50, help="FAISS candidates fed to the cross-encoder")
+    parser.add_argument("--rerank-top-k", type=int, default=4, help="Chunks kept after cross-encoder reranking")
+    parser.add_argument("--rerank-budget-ms", type=int, default=300, help="Reranking latency budget")
+    parser.add_argument("--rerank-pair-ms", type=float, default=0.0, help="Simulated stub cost per scored pair")
+    parser.add_argument("--rerank-model", help="Real cross-encoder model name instead of the stub")
+    parser.add_argument("--output", help="Write JSON results to this path")
+    parser.add_argument("--compare", help="Baseline JSON results to diff against")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    results = run(args)
+
+    payload = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(payload)
+        print(f"📊 Results written to {args.output}")
+    else:
+        print(payload)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import sys
+import time
+import types
+import hashlib
+import numpy as np
+
+STUB_DIMENSION = 384  # Same width as all-MiniLM-L6-v2
+
+
+class StubEmbeddingService:
+    """
+    Deterministic drop-in for EmbeddingService.
+    Vectors are derived from a hash of each word, so identical text always
+    maps to the identical vector and overlapping text lands close together.
+    """
+
+    def __init__(self, model_name: str = "stub", dimension: int = STUB_DIMENSION):
+        self.model_name = model_name
+        self.dimension = dimension
+
+    def _word_vector(self, word):
+        seed = int.from_bytes(hashlib.sha256(word.encode("utf-8")).digest()[:8], "little")
+        return np.random.default_rng(seed).standard_normal(self.dimension)
+
+    def embed_texts(self, texts: list):
+        if not texts:
+            return []
+
+        vectors = np.zeros((len(texts), self.dimension), dtype="float32")
+        for i, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[i] += self._word_vector(word)
+            norm = np.linalg.norm(vectors[i])
+            if norm > 0:
+                vectors[i] /= norm
+        return vectors
+
+
+class StubQAEngine:
+    """Deterministic drop-in for QAEngine that never leaves the machine."""
+
+    def generate_answer(self, question, chunks, expected_chunks=8):
+        if not chunks:
+            return {"answer": "Answer not found in the provided document.", "confidence": 0.0, "sources": []}
+
+        # Build the same prompt the real engine would send so its cost is measured
+        context = "\n\n".join(f"Source: {c['source']}\nContent: {c['text']}" for c in chunks)
+        user_prompt = f"DOCUMENT CONTEXT:\n{context}\n\nQUESTION: {question}"
+
+        return {
+            "answer": f"Stub answer from {len(chunks)} chunks ({len(user_prompt)} prompt chars).",
+            "confidence": round(min(1.0, len(chunks) / expected_chunks), 2),
+            "sources": chunks[:2],
+            "prompt_chars": len(user_prompt),
+        }
+
+
+class StubCrossEncoder:
+    """
+    Deterministic drop-in for sentence_transformers.CrossEncoder.
+    Scores by query-term density; pair_ms simulates per-pair model cost.
+    """
+
+    def __init__(self, pair_ms: float = 0.0):
+        self.pair_ms = pair_ms
+
+    def predict(self, pairs, batch_size=32):
+        if self.pair_ms:
+            time.sleep(self.pair_ms * len(pairs) / 1000)
+        scores = []
+        for query, text in pairs:
+            query_words = set(query.lower().strip("?").split())
+            text_words = text.lower().split()
+            hits = sum(1 for w in text_words if w in query_words)
+            scores.append(hits / (len(text_words) or 1))
+        return np.array(scores, dtype="float32")
+
+
+def install_stubs():
+    """
+    Registers the stub services under the real module names so that
+    `import app` picks them up without loading sentence-transformers or Groq.
+    Must be called before `app` is imported.
+    """
+    embedding_module = types.ModuleType("services.embedding_service")
+    embedding_module.EmbeddingService = StubEmbeddingService
+    qa_module = types.ModuleType("services.qa_engine")
+    qa_module.QAEngine = StubQAEngine
+
+    sys.modules["services.embedding_service"] = embedding_module
+    sys.modules["services.qa_engine"] = qa_module
@@ -16,4 +16,14 @@ class Config:
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     DATA_DIR = os.path.join(BASE_DIR, "data")
     UPLOAD_DIR = os.path.join(DATA_DIR, "uploads")
-    INDEX_DIR = os.path.join(DATA_DIR, "faiss_index")
\ No newline at end of file
+    INDEX_DIR = os.path.join(DATA_DIR, "faiss_index")
+
+    # Optional shared vector service (Unix socket); unset = per-worker VectorStore
+    VECTOR_SERVICE_SOCKET = os.getenv("VECTOR_SERVICE_SOCKET")
+    VECTOR_SERVICE_DEFAULT_SOCKET = os.path.join(DATA_DIR, "run", "vectors.sock")
+
+    # Optional cross-encoder reranking: FAISS candidates -> best chunks for the prompt
+    RERANKER_ENABLED = os.getenv("RERANKER_ENABLED", "false").lower() in ("1", "true", "yes")
+    RERANK_CANDIDATES = int(os.getenv("RERANK_CANDIDATES", 50))
+    RERANK_TOP_K = int(os.getenv("RERANK_TOP_K", 4))
+    RERANK_BUDGET_MS = int(os.getenv("RERANK_BUDGET_MS", 300))
\ No newline at end of file
@@ -0,0 +1,113 @@
+import time
+import threading
+from collections import OrderedDict
+
+from services.hybrid_search import hybrid_rerank
+
+
+class CrossEncoderReranker:
+    """
+    Second-stage reranker: scores (query, chunk) pairs with a small local
+    cross-encoder and keeps only the best chunks for the LLM prompt.
+    """
+
+    def __init__(self, model_name: str = "cross-encoder/ms-marco-MiniLM-L-6-v2", model=None,
+                 top_k=4, batch_size=16, budget_ms=300, cache_size=10000, probe_size=2):
+        if model is None:
+            from sentence_transformers import CrossEncoder
+            # Downloads the model on the first run (approx 90MB)
+            model = CrossEncoder(model_name)
+        self.model = model
+        # The first predict() pays one-off setup costs; keep them out of the cost estimate
+        self.model.predict([("warm up", "warm up")])
+        self.top_k = top_k
+        self.batch_size = batch_size
+        self.budget_ms = budget_ms
+        self.cache_size = cache_size
+        self.probe_size = probe_size
+        self._pair_ms = None  # Running estimate of model cost per (query, chunk) pair
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _cached(self, key):
+        with self._lock:
+            score = self._cache.get(key)
+            if score is not None:
+                self._cache.move_to_end(key)
+            return score
+
+    def _remember(self, key, score):
+        with self._lock:
+            self._cache[key] = score
+            self._cache.move_to_end(key)
+            # Evict least recently used scores once the cache is full
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _predict(self, query, chunks, batch, reset_estimate=False):
+        """Scores one batch, caches it and updates the per-pair cost estimate."""
+        t = time.perf_counter()
+        batch_scores = self.model.predict([(query, chunks[i]["text"]) for i in batch])
+        pair_ms = (time.perf_counter() - t) * 1000 / len(batch)
+        # Smoothed so one slow batch doesn't starve the next queries
+        if self._pair_ms is None or reset_estimate:
+            self._pair_ms = pair_ms
+        else:
+            self._pair_ms = 0.7 * self._pair_ms + 0.3 * pair_ms
+
+        scored = {}
+        for i, score in zip(batch, batch_scores):
+            scored[i] = float(score)
+            self._remember((query, chunks[i]["text"]), scored[i])
+        return scored
+
+    def rerank(self, query, candidates, fallback_k=8):
+        """
+        Returns the top_k FAISS candidates by cross-encoder score.
+        Batches are sized to fit the remaining latency budget. If the budget
+        runs out, scored chunks come first and the rest follow in hybrid
+        order; if nothing could be scored, the result is exactly the
+        non-reranked path, hybrid_rerank(query, candidates[:fallback_k]).
+        """
+        if not candidates:
+            return []
+
+        started = time.perf_counter()
+        scores = {}
+        pending = []
+        for i, c in enumerate(candidates):
+            score = self._cached((query, c["text"]))
+            if score is None:
+                pending.append(i)
+            else:
+                scores[i] = score
+
+        measured = False  # Whether this call has already timed a batch
+        while pending:
+            remaining_ms = self.budget_ms - (time.perf_counter() - started) * 1000
+            if remaining_ms <= 0:
+                break
+            recovery_probe = False
+            if self._pair_ms is None:
+                # No cost estimate yet: probe with a small batch
+                size = min(self.batch_size, self.probe_size)
+            else:
+                size = min(self.batch_size, int(remaining_ms / max(self._pair_ms, 1e-6)))
+            if size <= 0:
+                if measured:
+                    break
+                # Estimate says nothing fits: still score a small probe so a
+                # stale, inflated estimate can recover instead of sticking
+                size = min(self.batch_size, self.probe_size)
+                recovery_probe = True
+            batch, pending = pending[:size], pending[size:]
+            scores.update(self._predict(query, candidates, batch, reset_estimate=recovery_probe))
+            measured = True
+
+        if not scores:
+            return hybrid_rerank(query, candidates[:fallback_k])
+
+        # FAISS order breaks score ties; unscored chunks keep hybrid order
+        ranked = sorted(scores, key=lambda i: (-scores[i], i))
+        rest = hybrid_rerank(query, [candidates[i] for i in pending])
+        return ([candidates[i] for i in ranked] + rest)[:self.top_k]
@@ -0,0 +1,210 @@
+import os
+import json
+import time
+import hashlib
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from services.pdf_loader import extract_pages_from_pdf
+from services.text_cleaner import clean_text
+from services.text_chunker import MIN_CHUNK_CHARS, chunk_text
+
+
+def _lock_file(handle):
+    """Blocks until this process holds an exclusive lock on the open file."""
+    if fcntl:
+        fcntl.flock(handle, fcntl.LOCK_EX)
+        return
+    while True:
+        try:
+            # Locks the first byte; LK_LOCK itself gives up after ~10s, so keep retrying
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:
+            time.sleep(0.1)
+
+
+def _unlock_file(handle):
+    if fcntl:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def hash_file(path):
+    """SHA-256 of the raw file bytes (document-level change detection)."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def hash_text(text):
+    """SHA-256 of a cleaned page (page-level change detection)."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class DocumentManifest:
+    """
+    Per-user record of indexed documents: file hash plus one fingerprint
+    per page. Lives next to the FAISS index as documents.json.
+    """
+
+    def __init__(self, index_path):
+        self.manifest_file = os.path.join(index_path, "documents.json")
+        self.lock_file = os.path.join(index_path, "documents.lock")
+        self.documents = {}
+
+    @contextmanager
+    def locked(self):
+        """
+        Holds an exclusive per-user file lock and reloads the manifest inside
+        it, so uploads handled by different workers don't overwrite each other.
+        """
+        os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+        with open(self.lock_file, "a+") as lock:
+            _lock_file(lock)
+            try:
+                yield self.load()
+            finally:
+                _unlock_file(lock)
+
+    def load(self):
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file) as f:
+                self.documents = json.load(f)
+        else:
+            self.documents = {}
+        return self
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.manifest_file), exist_ok=True)
+        # Write-then-rename so a concurrent reader never sees a half-written file
+        tmp_file = self.manifest_file + ".tmp"
+        with open(tmp_file, "w") as f:
+            json.dump(self.documents, f)
+        os.replace(tmp_file, self.manifest_file)
+
+    def get(self, filename):
+        return self.documents.get(filename)
+
+    def set(self, filename, file_hash, page_hashes, groups):
+        self.documents[filename] = {"sha256": file_hash, "pages": page_hashes, "groups": groups}
+
+    def remove(self, filename):
+        self.documents.pop(filename, None)
+
+
+def group_pages(pages):
+    """
+    Groups 1-based page numbers so that pages too short to form a chunk on
+    their own are chunked together with the next page (or, at the end of
+    the document, the previous one) instead of being dropped.
+    """
+    groups, pending = [], []
+    for number, text in enumerate(pages, start=1):
+        pending.append(number)
+        if len(text.strip()) > MIN_CHUNK_CHARS:
+            groups.append(pending)
+            pending = []
+    if pending:
+        if groups:
+            groups[-1].extend(pending)
+        else:
+            groups.append(pending)
+    return groups
+
+
+def _match_groups(old_hashes, old_groups, page_hashes, groups):
+    """
+    Matches new page groups to old ones by content (the page hashes they
+    contain), not by position, so inserting or deleting a page only costs
+    that page. Returns (stale old anchors, retag {old anchor: new group},
+    new groups to re-chunk). An anchor is a group's first page number,
+    which is what its chunks are tagged with.
+    """
+    reusable = {}
+    for group in old_groups:
+        signature = tuple(old_hashes[n - 1] for n in group)
+        reusable.setdefault(signature, []).append(group[0])
+
+    retag, rebuild = {}, []
+    for group in groups:
+        matches = reusable.get(tuple(page_hashes[n - 1] for n in group))
+        if matches:
+            old_anchor = matches.pop(0)
+            # Same content under a new page number: keep the vectors, fix the tags
+            if old_anchor != group[0]:
+                retag[old_anchor] = group
+        else:
+            rebuild.append(group)
+
+    stale = {anchor for anchors in reusable.values() for anchor in anchors}
+    return stale, retag, rebuild
+
+
+def index_pdf(path, filename, vector_store, embedding_service, manifest):
+    """
+    Indexes an uploaded PDF, re-embedding only pages that changed since
+    the last upload of the same filename.
+    Returns (status, pages_embedded); status is "indexed", "updated" or "unchanged".
+    """
+    with manifest.locked():
+        # Pick up vectors written by other workers before modifying the index
+        vector_store.load()
+        return _index_pdf(path, filename, vector_store, embedding_service, manifest)
+
+
+def _index_pdf(path, filename, vector_store, embedding_service, manifest):
+    file_hash = hash_file(path)
+    previous = manifest.get(filename)
+    if previous and previous["sha256"] == file_hash:
+        return "unchanged", 0
+
+    pages = [clean_text(p) for p in extract_pages_from_pdf(path)]
+    page_hashes = [hash_text(p) for p in pages]
+    groups = group_pages(pages)
+
+    if previous:
+        old_hashes = previous["pages"]
+        old_groups = previous.get("groups") or [[n] for n in range(1, len(old_hashes) + 1)]
+        stale_pages, retag, rebuild = _match_groups(old_hashes, old_groups, page_hashes, groups)
+        if not (stale_pages or retag or rebuild):
+            # New bytes (e.g. metadata or re-save) but identical page text
+            manifest.set(filename, file_hash, page_hashes, groups)
+            manifest.save()
+            return "unchanged", 0
+        status = "updated"
+    else:
+        # Unknown file (or indexed before fingerprints existed): replace all of its chunks
+        stale_pages, retag, rebuild = None, None, groups
+        status = "indexed"
+
+    chunks = []
+    for group in rebuild:
+        text = "\n\n".join(pages[n - 1] for n in group)
+        # Chunks are tagged with the group's first page so they are replaced together
+        chunks.extend(chunk_text(text, source=filename, page=group[0], pages=group if len(group) > 1 else None))
+    embeddings = embedding_service.embed_texts([c["text"] for c in chunks])
+    vector_store.replace_chunks(filename, stale_pages, embeddings, chunks, retag)
+
+    manifest.set(filename, file_hash, page_hashes, groups)
+    manifest.save()
+    return status, sum(len(g) for g in rebuild)
+
+
+def remove_pdf(filename, vector_store, manifest):
+    """Drops a document's vectors and fingerprints."""
+    with manifest.locked():
+        vector_store.load()
+        vector_store.remove_chunks(filename)
+        manifest.remove(filename)
+        manifest.save()
@@ -1,25 +1,16 @@
 import fitz  # PyMuPDF
 
-def extract_text_from_pdf(pdf_path: str) -> str:
+def extract_pages_from_pdf(pdf_path: str) -> list:
     """
-    Extract text from a PDF file using PyMuPDF.
+    Extract text page by page, so callers can fingerprint and
+    re-index individual pages.
     """
-    text = ""
-
     try:
-        # Open the PDF document
         doc = fitz.open(pdf_path)
-
-        # Iterate through each page and extract text
-        for page_num in range(len(doc)):
-            page = doc[page_num]
-            text += page.get_text()
-
+        pages = [doc[page_num].get_text() for page_num in range(len(doc))]
         doc.close()
-
     except Exception as e:
         print(f"Error reading PDF: {e}")
-        return ""
+        return []
 
-    # Return trimmed text to remove leading/trailing whitespace
-    return text.strip()
\ No newline at end of file
+    return pages
\ No newline at end of file
@@ -8,7 +8,7 @@ class QAEngine:
     def __init__(self):
         self.client = Groq(api_key=os.getenv("GROQ_API_KEY"))
 
-    def generate_answer(self, question, chunks):
+    def generate_answer(self, question, chunks, expected_chunks=8):
         if not chunks:
             return {"answer": "Answer not found in the provided document.", "confidence": 0.0, "sources": []}
 
@@ -35,8 +35,8 @@ class QAEngine:
         )
 
         answer = response.choices[0].message.content.strip()
-        # Basic confidence score based on chunk availability
-        confidence = min(1.0, len(chunks) / 8)
+        # Basic confidence score based on chunk availability (relative to how many retrieval aims for)
+        confidence = min(1.0, len(chunks) / expected_chunks)
 
         return {
             "answer": answer,
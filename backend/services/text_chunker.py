@@ -1,4 +1,7 @@
-def chunk_text(text, source, chunk_size=500, overlap=100):
+MIN_CHUNK_CHARS = 100
+
+
+def chunk_text(text, source, chunk_size=500, overlap=100, page=None, pages=None):
     """Chunks text with overlap to preserve context across boundaries."""
     chunks = []
     start = 0
@@ -8,11 +11,17 @@ def chunk_text(text, source, chunk_size=500, overlap=100):
         chunk = text[start:end].strip()
 
         # Only keep chunks that carry meaningful information
-        if len(chunk) > 100:
+        if len(chunk) > MIN_CHUNK_CHARS:
             chunks.append({
                 "text": chunk,
                 "source": source
             })
+            # Page number lets a changed page's chunks be replaced on re-upload
+            if page is not None:
+                chunks[-1]["page"] = page
+            # Short pages merged into this chunk's text
+            if pages is not None:
+                chunks[-1]["pages"] = pages
 
         # Slide the window forward by less than chunk_size to create overlap
         start += chunk_size - overlap
@@ -0,0 +1,264 @@
+"""
+Optional machine-wide vector service.
+
+One process owns every user's VectorStore and serves search/add requests
+to all gunicorn workers over a Unix socket, so each index lives in memory
+once per machine and writes are immediately visible to every worker.
+
+Run it next to gunicorn (from backend/):
+    python -m services.vector_service
+and point the web app at the socket it prints (by default
+data/run/vectors.sock) with VECTOR_SERVICE_SOCKET.
+
+Messages are JSON plus an optional raw float32 payload for vectors;
+nothing received over the socket is ever unpickled.
+"""
+import os
+import json
+import stat
+import socket
+import struct
+import argparse
+import threading
+import socketserver
+import numpy as np
+
+from config import Config
+from services.vector_store import VectorStore
+
+# Windows CPython has no AF_UNIX: the local VectorStore path must still import there
+UNIX_SOCKETS_AVAILABLE = hasattr(socket, "AF_UNIX")
+_UnixServerBase = socketserver.UnixStreamServer if UNIX_SOCKETS_AVAILABLE else object
+_UNAVAILABLE_MESSAGE = "The vector service needs Unix domain sockets, which this platform lacks"
+
+# JSON length, then length of the raw float32 vector payload
+_HEADER = struct.Struct("!II")
+
+
+def _send(sock, message, vectors=None):
+    blob = b""
+    if vectors is not None:
+        vectors = np.asarray(vectors, dtype="float32")
+        message = {**message, "shape": list(vectors.shape)}
+        blob = vectors.tobytes()
+    data = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data), len(blob)) + data + blob)
+
+
+def _recv_exact(sock, size):
+    buf = bytearray()
+    while len(buf) < size:
+        part = sock.recv(size - len(buf))
+        if not part:
+            raise ConnectionError("Vector service connection closed")
+        buf.extend(part)
+    return bytes(buf)
+
+
+def _recv(sock):
+    """Returns (message, vectors); vectors is None when no payload was sent."""
+    size, blob_size = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    message = json.loads(_recv_exact(sock, size).decode("utf-8"))
+    vectors = None
+    if "shape" in message:
+        vectors = np.frombuffer(_recv_exact(sock, blob_size), dtype="float32").reshape(message["shape"])
+    return message, vectors
+
+
+def _prepare_socket_dir(socket_dir):
+    """
+    Ensures the socket lives in a directory only this user can enter.
+    A missing directory is created 0700; an existing one is never modified,
+    only checked, so pointing the service at /tmp or /run fails loudly.
+    """
+    if not os.path.isdir(socket_dir):
+        old_umask = os.umask(0o077)
+        try:
+            os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        finally:
+            os.umask(old_umask)
+        return
+
+    info = os.stat(socket_dir)
+    if info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise RuntimeError(
+            f"Refusing to start: socket directory {socket_dir} must be owned by this user "
+            f"with no group/other permissions (found mode {oct(info.st_mode & 0o777)})"
+        )
+
+
+class _Shard:
+    """A single user's VectorStore plus the lock that serialises writes to it."""
+
+    def __init__(self, index_path):
+        self.store = VectorStore(index_path)
+        self.store.load()
+        self.lock = threading.RLock()
+
+
+class VectorServiceServer(socketserver.ThreadingMixIn, _UnixServerBase):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        if not UNIX_SOCKETS_AVAILABLE:
+            raise RuntimeError(_UNAVAILABLE_MESSAGE)
+        _prepare_socket_dir(os.path.dirname(os.path.abspath(socket_path)))
+        if os.path.lexists(socket_path):
+            if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+                raise RuntimeError(f"Refusing to start: {socket_path} exists and is not a socket")
+            # Stale socket from a previous run
+            os.remove(socket_path)
+        self.shards = {}
+        self.shards_lock = threading.Lock()
+        # Owner-only permissions from the moment the socket is bound
+        old_umask = os.umask(0o077)
+        try:
+            super().__init__(socket_path, _VectorRequestHandler)
+        finally:
+            os.umask(old_umask)
+
+    def shard(self, index_path):
+        """Returns the shard for an index directory, loading it from disk on first use."""
+        key = os.path.abspath(index_path)
+        with self.shards_lock:
+            shard = self.shards.get(key)
+            if shard is None:
+                shard = self.shards[key] = _Shard(key)
+            return shard
+
+    def handle_op(self, message, vectors):
+        op = message["op"]
+        shard = self.shard(message["index_path"])
+        with shard.lock:
+            store = shard.store
+            if op == "stats":
+                pass
+            elif op == "search":
+                return store.search(vectors[0], message["top_k"])
+            elif op == "add":
+                store.create_or_update_index(vectors, message["metadata"])
+            elif op == "replace":
+                pages = set(message["pages"]) if message["pages"] is not None else None
+                embeddings = vectors if message["metadata"] else []
+                # JSON object keys are strings, so retag travels as [old page, new group] pairs
+                retag = {old: group for old, group in message.get("retag") or []}
+                store.replace_chunks(message["source"], pages, embeddings, message["metadata"], retag)
+            elif op == "reset":
+                store.reset()
+            else:
+                raise ValueError(f"Unknown vector service op: {op}")
+            return {"ntotal": store.index.ntotal if store.index is not None else 0,
+                    "dimension": store.index.d if store.index is not None else None}
+
+
+class _VectorRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        try:
+            message, vectors = _recv(self.request)
+            result = {"ok": True, "result": self.server.handle_op(message, vectors)}
+        except ConnectionError:
+            return
+        except Exception as e:
+            result = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+        _send(self.request, result)
+
+
+class VectorServiceUnavailable(RuntimeError):
+    """The vector service socket is missing or nothing is listening on it."""
+
+
+class _RemoteIndex:
+    """Stand-in for the FAISS index attribute so `if not store.index` keeps working."""
+
+    def __init__(self, ntotal, d):
+        self.ntotal = ntotal
+        self.d = d
+
+
+class RemoteVectorStore:
+    """
+    Client for VectorServiceServer with the same interface as VectorStore,
+    so the two can be swapped without touching the calling code.
+    """
+
+    def __init__(self, index_path, socket_path):
+        if not UNIX_SOCKETS_AVAILABLE:
+            raise RuntimeError(_UNAVAILABLE_MESSAGE)
+        self.index_path = os.path.abspath(index_path)
+        self.socket_path = socket_path
+        self.index = None
+
+    def _call(self, op, vectors=None, **fields):
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(self.socket_path)
+                _send(sock, {"op": op, "index_path": self.index_path, **fields}, vectors)
+                response, _ = _recv(sock)
+        except OSError as e:
+            # Covers a missing socket, a refused connection and a dropped one
+            raise VectorServiceUnavailable(f"Vector service unavailable at {self.socket_path}: {e}") from e
+        if not response["ok"]:
+            raise RuntimeError(f"Vector service error: {response['error']}")
+        return response["result"]
+
+    def _update_stats(self, stats):
+        self.index = _RemoteIndex(stats["ntotal"], stats["dimension"]) if stats["ntotal"] else None
+
+    def create_or_update_index(self, embeddings, new_metadata):
+        """Adds vectors to the user's index inside the service (persisted there)."""
+        self._update_stats(self._call("add", embeddings, metadata=new_metadata))
+
+    def search(self, query_embedding, top_k=8):
+        """Retrieves top_k relevant chunks from the shared index."""
+        return self._call("search", [query_embedding], top_k=top_k)
+
+    def replace_chunks(self, source, pages, embeddings, new_metadata, retag=None):
+        """Swaps a document's chunks (or only some pages) inside the service."""
+        pages = sorted(pages) if pages is not None else None
+        vectors = embeddings if new_metadata else None
+        retag = sorted(retag.items()) if retag else None
+        self._update_stats(self._call("replace", vectors, source=source, pages=pages,
+                                      metadata=new_metadata, retag=retag))
+
+    def remove_chunks(self, source, pages=None):
+        """Removes a document's chunks (optionally only some pages) from the service."""
+        self.replace_chunks(source, pages, [], [])
+
+    def reset(self):
+        """Drops every vector for this user, in memory and on disk."""
+        self._update_stats(self._call("reset"))
+
+    def save(self):
+        """No-op: the service persists after every write."""
+
+    def load(self):
+        """Fetches index stats; the vectors themselves stay in the service."""
+        self._update_stats(self._call("stats"))
+
+
+def open_vector_store(index_path, socket_path=None):
+    """Returns a RemoteVectorStore when a vector service socket is configured, else a local VectorStore."""
+    if socket_path:
+        return RemoteVectorStore(index_path, socket_path)
+    return VectorStore(index_path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Shared FAISS vector service")
+    parser.add_argument("--socket", default=Config.VECTOR_SERVICE_SOCKET or Config.VECTOR_SERVICE_DEFAULT_SOCKET)
+    args = parser.parse_args(argv)
+
+    server = VectorServiceServer(args.socket)
+    print(f"🧠 Vector service listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(args.socket):
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
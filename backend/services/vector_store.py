@@ -24,6 +24,50 @@ class VectorStore:
         self.metadata.extend(new_metadata)
         self.save()
 
+    def replace_chunks(self, source, pages, embeddings, new_metadata, retag=None):
+        """
+        Drops a document's chunks (only the given page numbers, or all of
+        them when pages is None) and adds the new ones in a single save.
+        retag maps an old page number to the new page group for chunks
+        whose content only moved; it is applied after the removal, before
+        the new chunks are added.
+        """
+        if self.index is not None:
+            stale = [i for i, m in enumerate(self.metadata) if self._matches(m, source, pages)]
+            if stale:
+                # IndexFlat compacts in order, so metadata positions stay aligned
+                self.index.remove_ids(np.array(stale, dtype="int64"))
+                self.metadata = [m for m in self.metadata if not self._matches(m, source, pages)]
+            if retag:
+                self.metadata = [self._retagged(m, source, retag) for m in self.metadata]
+
+        if new_metadata:
+            self.create_or_update_index(embeddings, new_metadata)
+        elif self.index is None or self.index.ntotal == 0:
+            self.reset()
+        else:
+            self.save()
+
+    def remove_chunks(self, source, pages=None):
+        """Removes a document's chunks (optionally only some pages) from the index."""
+        self.replace_chunks(source, pages, [], [])
+
+    @staticmethod
+    def _retagged(meta, source, retag):
+        group = retag.get(meta.get("page")) if meta.get("source") == source else None
+        if group is None:
+            return meta
+        # Copy, so chunks already handed out by search() aren't changed underneath callers
+        meta = {k: v for k, v in meta.items() if k != "pages"}
+        meta["page"] = group[0]
+        if len(group) > 1:
+            meta["pages"] = group
+        return meta
+
+    @staticmethod
+    def _matches(meta, source, pages):
+        return meta.get("source") == source and (pages is None or meta.get("page") in pages)
+
     def search(self, query_embedding, top_k=8):
         """
         Retrieves top_k relevant chunks. 
@@ -45,6 +89,14 @@ class VectorStore:
         
         return results
 
+    def reset(self):
+        """Removes every vector and the persisted files for this index."""
+        self.index = None
+        self.metadata = []
+        for path in (self.index_file, self.metadata_file):
+            if os.path.exists(path):
+                os.remove(path)
+
     def save(self):
         """Persists the FAISS index and metadata to disk."""
         if not os.path.exists(self.index_path):